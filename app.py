@@ -1,21 +1,43 @@
 # app.py — Login-protected flashcards with basic usage tracking
 
 import os
-import json
+import sys
+import queue
 import sqlite3
+import threading
+import time
+import atexit
 import uuid
+import zlib
+import gzip
 import hashlib
+import functools
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+
+# orjson parses/serializes several times faster than the stdlib and works on
+# bytes directly; fall back to json where it isn't installed.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 from flask import (
     Flask,
     request,
+    Response,
     jsonify,
     send_from_directory,
     abort,
-    make_response,
     redirect,
     session,
     g,
@@ -29,12 +51,22 @@ CARDS_DIR = STATIC_DIR / "cards"
 DATA_DIR = ROOT / "data"
 CARDS_JSON = DATA_DIR / "cards.json"
 
+# Card images and the logo only change with a deploy, so let browsers keep
+# them for a year; a stale copy revalidates against the mtime/size ETag.
+STATIC_MAX_AGE = 31536000
+
 DB_PATH = os.environ.get("DB_PATH", str(ROOT / "app.db"))
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "4"))
 BUILD_ID = os.environ.get("BUILD_ID", str(uuid.uuid4())[:8])
 
 app = Flask(__name__, static_folder=str(STATIC_DIR), static_url_path="/static")
 app.secret_key = os.environ.get("FLASK_SECRET", "dev-secret-change-me")
 
+# Behind a proxy that understands X-Sendfile (Apache mod_xsendfile, or nginx
+# mapping it to X-Accel-Redirect), let the proxy stream files with sendfile(2)
+# instead of pushing the bytes through the WSGI worker.
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE", "0") == "1"
+
 # --- Bootstrap dirs ---------------------------------------------------------
 
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
@@ -43,35 +75,61 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # --- Helpers ----------------------------------------------------------------
 
-def _nocache(resp):
-    resp.cache_control.no_store = True
-    resp.cache_control.max_age = 0
-    resp.headers["Pragma"] = "no-cache"
-    resp.headers["Expires"] = "0"
+def _send_immutable(directory: Path, filename: str):
+    # send_from_directory() rejects traversal and 404s on missing files, and
+    # sets an mtime/size ETag that it answers conditionally.
+    resp = send_from_directory(str(directory), filename, max_age=STATIC_MAX_AGE)
+    resp.cache_control.immutable = True
     return resp
 
-@app.before_request
-def _log_req():
-    print(
-        f"[{BUILD_ID}] {request.method} {request.path} "
-        f"Accept={request.headers.get('Accept','')} "
-        f"Sec-Fetch-Mode={request.headers.get('Sec-Fetch-Mode','')}"
-    )
-
 # --- DB + users -------------------------------------------------------------
 
+# Long-lived connections reused across requests in this worker. LIFO keeps
+# the most recently used (warmest) connection at the front.
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+def _connect() -> sqlite3.Connection:
+    # Pooled connections move between request threads, but only one request
+    # holds a given connection at a time.
+    con = sqlite3.connect(DB_PATH, check_same_thread=False)
+    con.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode=WAL is persisted in the db file
+    # and is set once by init_db().
+    con.executescript("""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA busy_timeout=5000;
+    """)
+    return con
+
 def get_db():
     if "db" not in g:
-        g.db = sqlite3.connect(DB_PATH)
-        g.db.row_factory = sqlite3.Row
+        try:
+            g.db = _pool.get_nowait()
+        except queue.Empty:
+            g.db = _connect()
     return g.db
 
 @app.teardown_appcontext
 def close_db(exc):
     db = g.pop("db", None)
-    if db is not None:
+    if db is None:
+        return
+    if db.in_transaction:
+        db.rollback()
+    try:
+        _pool.put_nowait(db)
+    except queue.Full:
         db.close()
 
+def _drain_pool():
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            return
+
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode("utf-8")).hexdigest()
 
@@ -106,6 +164,7 @@ def create_user(email: str, raw_password: str) -> int:
 
 def init_db():
     db = get_db()
+    db.execute("PRAGMA journal_mode=WAL")
 
     # Users table
     db.execute("""
@@ -129,6 +188,10 @@ def init_db():
             FOREIGN KEY (user_id) REFERENCES users(id)
         )
     """)
+    db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_login_events_user_ts
+        ON login_events (user_id, ts)
+    """)
 
     db.commit()
 
@@ -163,8 +226,93 @@ def init_db():
                 f"{bootstrap_email} / {bootstrap_password}"
             )
 
+# --- Login event writer -----------------------------------------------------
+
+# Login events are queued and written by a single background thread, so a
+# login doesn't wait on an fsync and bursts share one transaction.
+EVENT_BATCH_SIZE = 100
+EVENT_FLUSH_SECS = 0.25
+
+_event_q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+_event_writer: Optional[threading.Thread] = None
+_event_writer_lock = threading.Lock()
+_EVENT_STOP = object()
+
+def _event_writer_loop():
+    con = _connect()
+    stopping = False
+    while not stopping:
+        item = _event_q.get()
+        if item is _EVENT_STOP:
+            break
+        batch = [item]
+        deadline = time.monotonic() + EVENT_FLUSH_SECS
+        while len(batch) < EVENT_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _event_q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _EVENT_STOP:
+                stopping = True
+                break
+            batch.append(item)
+        _write_login_events(con, batch)
+    con.close()
+
+def _write_login_events(con: sqlite3.Connection, batch: List[Any]):
+    # A failed batch (e.g. still SQLITE_BUSY after busy_timeout) is retried
+    # once before it is dropped, so a brief lock doesn't lose events.
+    for attempt in (1, 2):
+        try:
+            with con:
+                con.executemany(
+                    """
+                    INSERT INTO login_events (user_id, ts, ip, user_agent)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    batch,
+                )
+            return
+        except sqlite3.Error:
+            if attempt == 1:
+                app.logger.exception(
+                    "Failed to write %d login events; retrying", len(batch)
+                )
+                time.sleep(EVENT_FLUSH_SECS)
+            else:
+                app.logger.exception("Dropping %d login events", len(batch))
+
+def _ensure_event_writer():
+    global _event_writer
+    if _event_writer is not None and _event_writer.is_alive():
+        return
+    with _event_writer_lock:
+        if _event_writer is None or not _event_writer.is_alive():
+            _event_writer = threading.Thread(
+                target=_event_writer_loop,
+                name="login-event-writer",
+                daemon=True,
+            )
+            _event_writer.start()
+
+def record_login_event(user_id: int, ts: str, ip: Optional[str], user_agent: str):
+    _ensure_event_writer()
+    _event_q.put((user_id, ts, ip, user_agent))
+
+@atexit.register
+def _flush_login_events():
+    writer = _event_writer
+    if writer is not None and writer.is_alive():
+        _event_q.put(_EVENT_STOP)
+        writer.join(timeout=5)
+
 with app.app_context():
     init_db()
+# Don't carry open connections across a gunicorn --preload fork.
+_drain_pool()
 
 # --- Login UI ---------------------------------------------------------------
 
@@ -231,7 +379,9 @@ LOGIN_HTML = """
 </html>
 """
 
-from flask import render_template_string  # placed here to avoid cluttering the main import
+# Compile once at import; the blank form (plain GET) is the same every time.
+_LOGIN_TMPL = app.jinja_env.from_string(LOGIN_HTML)
+_LOGIN_PAGE = _LOGIN_TMPL.render(error=None, email="")
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -242,8 +392,7 @@ def login():
 
         if not user or not verify_password(password, user["password_hash"]):
             return (
-                render_template_string(
-                    LOGIN_HTML,
+                _LOGIN_TMPL.render(
                     error="Invalid email or password",
                     email=email,
                 ),
@@ -251,20 +400,12 @@ def login():
             )
 
         # Track login event for theft/usage analysis
-        db = get_db()
-        db.execute(
-            """
-            INSERT INTO login_events (user_id, ts, ip, user_agent)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                int(user["id"]),
-                datetime.utcnow().isoformat(),
-                request.headers.get("X-Forwarded-For", request.remote_addr),
-                request.headers.get("User-Agent", ""),
-            ),
+        record_login_event(
+            int(user["id"]),
+            datetime.utcnow().isoformat(),
+            request.headers.get("X-Forwarded-For", request.remote_addr),
+            request.headers.get("User-Agent", ""),
         )
-        db.commit()
 
         session["user_id"] = int(user["id"])
         session["user_email"] = user["email"]
@@ -273,7 +414,7 @@ def login():
     # GET
     if session.get("user_id"):
         return redirect("/")
-    return render_template_string(LOGIN_HTML, error=None, email="")
+    return _LOGIN_PAGE
 
 @app.route("/logout", methods=["GET", "POST"])
 def logout():
@@ -282,19 +423,14 @@ def logout():
 
 # --- Auth guard: protect UI + API unless logged in --------------------------
 
+# Always allow static files, login/logout, logo, and health checks
+_OPEN_PATHS = frozenset({"/logo.jpg", "/login", "/logout", "/health"})
+_OPEN_PREFIXES = ("/static/", "/cards/")
+
 @app.before_request
 def require_login():
     path = request.path
-
-    # Always allow static files, login/logout, logo, and health checks
-    if (
-        path.startswith("/static/")
-        or path.startswith("/cards/")
-        or path == "/logo.jpg"
-        or path == "/login"
-        or path == "/logout"
-        or path == "/health"
-    ):
+    if path in _OPEN_PATHS or path.startswith(_OPEN_PREFIXES):
         return None
 
     # Already logged in?
@@ -314,139 +450,290 @@ def health():
 
 # --- Cards loader -----------------------------------------------------------
 
-_cards_cache: Optional[List[Dict[str, Any]]] = None
-
-def load_cards() -> List[Dict[str, Any]]:
-    global _cards_cache
-    if _cards_cache is not None:
-        return _cards_cache
+class CardDeck(NamedTuple):
+    # Everything derived from one load of cards.json. A deck is never
+    # mutated; a reload builds a new one and publishes it in one assignment,
+    # so a request reading from the deck it got can't mix generations.
+    cards: List[Dict[str, Any]]
+    # (st_mtime_ns, st_size) of cards.json when the deck was built
+    key: Optional[Tuple[int, int]]
+    by_category: Dict[str, List[Dict[str, Any]]]
+    by_category_json: Dict[str, bytes]
+    cards_json: bytes
+    cards_json_gz: bytes
+    categories_json: bytes
+    categories_etag: str
+    bootstrap_json: bytes
+    bootstrap_json_gz: bytes
+
+_deck: Optional[CardDeck] = None
+_cards_lock = threading.Lock()
+
+def _build_deck(cards: List[Dict[str, Any]], key: Optional[Tuple[int, int]]) -> CardDeck:
+    # Serialize the API payloads once per load instead of on every request.
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for c in cards:
+        by_category.setdefault(c["category"], []).append(c)
+    cats = sorted(k for k in by_category if k)
+    cards_json = _json_dumps(cards)
+    categories_json = _json_dumps(cats)
+    bootstrap_json = (
+        b'{"cards":' + cards_json
+        + b',"categories":' + categories_json + b"}"
+    )
+    return CardDeck(
+        cards=cards,
+        key=key,
+        by_category=by_category,
+        by_category_json={k: _json_dumps(v) for k, v in by_category.items()},
+        cards_json=cards_json,
+        # The large payloads are compressed once here, not per request.
+        cards_json_gz=gzip.compress(cards_json, compresslevel=6, mtime=0),
+        categories_json=categories_json,
+        categories_etag=hashlib.blake2b(categories_json, digest_size=8).hexdigest(),
+        bootstrap_json=bootstrap_json,
+        bootstrap_json_gz=gzip.compress(bootstrap_json, compresslevel=6, mtime=0),
+    )
 
-    if not CARDS_JSON.exists():
-        _cards_cache = [{
-            "id": 999,
-            "category": "Demo",
-            "question": "Demo Q",
-            "image": "/cards/demo_front.jpg",
-            "answer": "Demo A",
-            "answer_image": "/cards/demo_back.jpg",
-            "url": ""
-        }]
-        return _cards_cache
+# Served only when cards.json doesn't exist at first load.
+_DEMO_CARD: Dict[str, Any] = {
+    "id": 999,
+    "category": "Demo",
+    "question": "Demo Q",
+    "image": "/cards/demo_front.jpg",
+    "answer": "Demo A",
+    "answer_image": "/cards/demo_back.jpg",
+    "url": ""
+}
 
-    with CARDS_JSON.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+def _read_cards() -> List[Dict[str, Any]]:
+    data = _json_loads(CARDS_JSON.read_bytes())
 
     if not isinstance(data, list):
         raise ValueError("cards.json must be a list")
 
+    # Categories and URLs repeat across most of the deck; intern them so
+    # every card shares one string object per distinct value.
     for c in data:
         c.setdefault("id", None)
-        c.setdefault("category", "")
+        cat = c.get("category")
+        if isinstance(cat, str):
+            cat = cat.strip()
+        else:
+            cat = "" if cat is None else str(cat).strip()
+        c["category"] = sys.intern(cat)
         c.setdefault("question", "")
         c.setdefault("image", "")
         c.setdefault("answer", "")
         c.setdefault("answer_image", "")
-        c.setdefault("url", "")
-
-    _cards_cache = data
-    return _cards_cache
+        url = c.setdefault("url", "")
+        if isinstance(url, str):
+            c["url"] = sys.intern(url)
+
+    return data
+
+# Key of a cards.json that failed to load, so it's parsed once rather than
+# on every request until the file changes again.
+_cards_bad_key: Optional[Tuple[int, int]] = None
+
+def _deck_is_current(deck: Optional[CardDeck], key: Optional[Tuple[int, int]]) -> bool:
+    # A missing file (e.g. mid-deploy) or one that already failed to load
+    # keeps the deck we have.
+    return deck is not None and (key is None or key == deck.key or key == _cards_bad_key)
+
+def load_cards() -> CardDeck:
+    # One stat() per call; cards.json is only re-parsed when it changes.
+    # Size is part of the key because mtime can be coarse on some
+    # filesystems and miss a quick rewrite.
+    try:
+        st = CARDS_JSON.stat()
+        key: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        key = None
+
+    global _deck, _cards_bad_key
+    deck = _deck
+    if _deck_is_current(deck, key):
+        return deck
+
+    with _cards_lock:
+        deck = _deck
+        if _deck_is_current(deck, key):
+            return deck
+        if key is None:
+            _deck = _build_deck([dict(_DEMO_CARD)], None)
+            return _deck
+        try:
+            cards = _read_cards()
+        except (OSError, ValueError, TypeError, AttributeError):
+            # Editors and cp rewrite in place, so a reload can see a
+            # half-written file. Keep serving the last good deck.
+            if deck is None:
+                raise
+            app.logger.exception(
+                "Failed to reload %s; keeping the previous deck", CARDS_JSON
+            )
+            _cards_bad_key = key
+            return deck
+        _deck = _build_deck(cards, key)
+        _cards_bad_key = None
+        return _deck
 
 # --- Static assets ----------------------------------------------------------
 
 @app.route("/logo.jpg")
 def serve_logo():
-    path = STATIC_DIR / "logo.jpg"
-    if not path.exists():
-        abort(404)
-    return send_from_directory(str(STATIC_DIR), "logo.jpg")
+    return _send_immutable(STATIC_DIR, "logo.jpg")
 
 @app.route("/cards/<path:filename>")
 def serve_card_file(filename):
-    file_path = CARDS_DIR / filename
-    if not file_path.exists() or not file_path.is_file():
-        abort(404)
-    return send_from_directory(str(CARDS_DIR), filename)
+    return _send_immutable(CARDS_DIR, filename)
 
 # --- UI shell (SPA) ---------------------------------------------------------
 
-@app.route("/")
-def index():
-    resp = make_response(send_from_directory(app.static_folder, "index.html"))
-    return _nocache(resp)
+# The shell only changes with a deploy, so keep it in memory. Browsers must
+# revalidate on every load (no-cache), which a matching ETag answers with 304.
+_index_path = STATIC_DIR / "index.html"
+INDEX_BYTES: Optional[bytes] = _index_path.read_bytes() if _index_path.is_file() else None
+INDEX_ETAG = hashlib.md5(INDEX_BYTES).hexdigest() if INDEX_BYTES is not None else ""
+
+@app.route("/", defaults={"maybe_client_route": ""})
+@app.route("/<path:maybe_client_route>")
+def index(maybe_client_route):
+    if maybe_client_route.startswith("api/"):
+        return jsonify({"error": "Not found"}), 404
+    # A missing file (favicon.ico, app.js.map, ...) isn't a client route;
+    # 404 it rather than answering with the HTML shell.
+    if INDEX_BYTES is None or "." in maybe_client_route.rsplit("/", 1)[-1]:
+        abort(404)
+    resp = Response(INDEX_BYTES, mimetype="text/html")
+    resp.set_etag(INDEX_ETAG)
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
 
 @app.route("/index.html")
 def index_html():
     return redirect("/")
 
-@app.route("/<path:maybe_client_route>")
-def spa_fallback(maybe_client_route):
-    if not maybe_client_route.startswith("api/"):
-        resp = make_response(send_from_directory(app.static_folder, "index.html"))
-        return _nocache(resp)
-    return jsonify({"error": "Not found"}), 404
-
 # --- API --------------------------------------------------------------------
 
-@app.route("/api/cards", methods=["GET"])
-def api_get_cards():
+NDJSON_CHUNK_CARDS = 64
+
+def _json_response(body: bytes, body_gz: bytes) -> Response:
+    # Serve the precompressed copy to clients that accept gzip.
+    if request.accept_encodings["gzip"]:
+        resp = Response(body_gz, mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+def bounce_navigation(view):
     # If someone navigates here in the address bar, bounce back to UI.
-    if request.headers.get("Sec-Fetch-Mode", "") == "navigate":
-        return redirect("/", code=302)
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.headers.get("Sec-Fetch-Mode") == "navigate":
+            return redirect("/", code=302)
+        return view(*args, **kwargs)
+    return wrapper
 
-    cards = load_cards()
+@app.route("/api/cards", methods=["GET"])
+@bounce_navigation
+def api_get_cards():
+    deck = load_cards()
     categories_param = request.args.get("categories", "").strip()
-    if categories_param:
-        wanted = {c for c in categories_param.split(",") if c}
-        cards = [
-            c for c in cards
-            if str(c.get("category", "")).strip() in wanted
-        ]
-    return jsonify(cards)
+    if not categories_param:
+        return _json_response(deck.cards_json, deck.cards_json_gz)
+
+    wanted = list(dict.fromkeys(c for c in categories_param.split(",") if c))
+    if len(wanted) == 1:
+        body = deck.by_category_json.get(wanted[0], b"[]")
+    else:
+        body = _json_dumps([c for k in wanted for c in deck.by_category.get(k, ())])
+    return Response(body, mimetype="application/json")
+
+@app.route("/api/cards.ndjson", methods=["GET"])
+@bounce_navigation
+def api_get_cards_ndjson():
+    # One card per line, encoded as it is sent, so large decks don't need
+    # the whole body built in memory and clients can parse incrementally.
+    # Lines go out NDJSON_CHUNK_CARDS at a time rather than one write per card.
+    cards = load_cards().cards
+    use_gzip = bool(request.accept_encodings["gzip"])
+
+    def chunks():
+        for i in range(0, len(cards), NDJSON_CHUNK_CARDS):
+            yield b"".join(
+                _json_dumps(c) + b"\n" for c in cards[i:i + NDJSON_CHUNK_CARDS]
+            )
+
+    def gzipped():
+        # Sync-flush after each chunk so the client can decode it on arrival.
+        z = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks():
+            yield z.compress(chunk) + z.flush(zlib.Z_SYNC_FLUSH)
+        yield z.flush()
+
+    resp = Response(gzipped() if use_gzip else chunks(), mimetype="application/x-ndjson")
+    if use_gzip:
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    return resp
 
 @app.route("/api/categories", methods=["GET"])
 def api_categories():
-    cards = load_cards()
-    cats = sorted({
-        str(c.get("category", "")).strip()
-        for c in cards
-        if str(c.get("category", "")).strip()
-    })
-    return jsonify(cats)
-
-# Stub endpoints for future per-user state, currently no-ops
+    deck = load_cards()
+    resp = Response(deck.categories_json, mimetype="application/json")
+    resp.set_etag(deck.categories_etag)
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 60
+    return resp.make_conditional(request)
+
+@app.route("/api/bootstrap", methods=["GET"])
+@bounce_navigation
+def api_bootstrap():
+    # Everything the SPA needs on page load, in one response.
+    deck = load_cards()
+    return _json_response(deck.bootstrap_json, deck.bootstrap_json_gz)
+
+# Stub endpoints for future per-user state, currently no-ops. Their bodies
+# never change, so they're serialized once.
+_EMPTY_STATE_BYTES = _json_dumps({
+    "current_index": 0,
+    "correct": 0,
+    "incorrect": 0,
+    "seen": 0,
+    "deck_order": [],
+    "category_filters": []
+})
+_OK_BYTES = _json_dumps({"ok": True})
+
 @app.route("/api/state", methods=["GET"])
 def api_get_state():
-    return jsonify({
-        "current_index": 0,
-        "correct": 0,
-        "incorrect": 0,
-        "seen": 0,
-        "deck_order": [],
-        "category_filters": []
-    })
-
-@app.route("/api/state", methods=["POST"])
-def api_set_state():
-    return jsonify({"ok": True})
-
-@app.route("/api/restart", methods=["POST"])
-def api_restart():
-    return jsonify({"ok": True})
-
-@app.route("/api/hide", methods=["POST"])
-def api_hide():
-    return jsonify({"ok": True})
-
-@app.route("/api/unhide_all", methods=["POST"])
-def api_unhide_all():
-    return jsonify({"ok": True})
+    return Response(_EMPTY_STATE_BYTES, mimetype="application/json")
+
+def _api_ok():
+    return Response(_OK_BYTES, mimetype="application/json")
+
+app.add_url_rule("/api/state", endpoint="api_set_state", view_func=_api_ok, methods=["POST"])
+app.add_url_rule("/api/restart", endpoint="api_restart", view_func=_api_ok, methods=["POST"])
+app.add_url_rule("/api/hide", endpoint="api_hide", view_func=_api_ok, methods=["POST"])
+app.add_url_rule("/api/unhide_all", endpoint="api_unhide_all", view_func=_api_ok, methods=["POST"])
 
 # --- Entrypoint -------------------------------------------------------------
 
+# Development server only. In production run under gunicorn with threaded
+# workers, e.g.:
+#
+#   gunicorn -w 4 -k gthread --threads 8 --access-logfile - app:app
+
 if __name__ == "__main__":
+    if os.environ.get("FLASK_ENV") == "production":
+        raise SystemExit("Use gunicorn, not app.run, when FLASK_ENV=production")
     host = os.environ.get("FLASK_HOST", "127.0.0.1")
     port = int(os.environ.get("FLASK_PORT", "5000"))
-    debug = os.environ.get("FLASK_DEBUG", "1") == "1"
+    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
     print(f"[{BUILD_ID}] UI:    http://{host}:{port}/")
     print(f"[{BUILD_ID}] API:   http://{host}:{port}/api")
     print(f"[{BUILD_ID}] Files: http://{host}:{port}/cards/<file>  -> {CARDS_DIR}")